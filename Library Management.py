@@ -1,337 +1,473 @@
-#!/usr/bin/env python3
-"""
-Library Management System (File-based)
-
-• Console, menu–driven interface
-• OOP design with single & multilevel inheritance
-• storage in CSV files (books, users, loans)
-
-CSV schema
-──────────
-books.csv   →  id,title,author,total,available
-users.csv   →  id,name
-loans.csv   →  user_id,book_id,borrow_date,return_date
-"""
-from __future__ import annotations
-import csv
-import datetime as dt
-import os
-from pathlib import Path
-from textwrap import dedent
-from typing import Dict, List, Optional
-
-DATA_DIR = Path(__file__).with_suffix('')  # folder where script resides
-BOOKS_FILE  = DATA_DIR / "books.csv"
-USERS_FILE  = DATA_DIR / "users.csv"
-LOANS_FILE  = DATA_DIR / "loans.csv"
-
-
-# ────────────────────────────────────────────────────────────
-# DATA MODELS
-# ────────────────────────────────────────────────────────────
-class Entity:                       # ← base class
-    """Generic object that owns a numeric id."""
-    _id_counter = 1
-
-    def __init__(self, entity_id: Optional[int] = None):
-        self.id = entity_id or Entity._id_counter
-        Entity._id_counter = max(Entity._id_counter, self.id + 1)
-
-
-class Book(Entity):                 # ← single inheritance
-    def __init__(self, title: str, author: str,
-                 total: int, available: int | None = None,
-                 entity_id: Optional[int] = None):
-        super().__init__(entity_id)
-        self.title, self.author = title, author
-        self.total = total
-        self.available = available if available is not None else total
-
-    # convenience helpers
-    def to_row(self) -> List[str]:
-        return [str(self.id), self.title, self.author,
-                str(self.total), str(self.available)]
-
-    @classmethod
-    def from_row(cls, row: List[str]) -> "Book":
-        bid, title, author, total, avail = row
-        return cls(title, author, int(total), int(avail), int(bid))
-
-
-class User(Entity):                 # ← single inheritance
-    def __init__(self, name: str, entity_id: Optional[int] = None):
-        super().__init__(entity_id)
-        self.name = name
-
-    def to_row(self) -> List[str]:
-        return [str(self.id), self.name]
-
-    @classmethod
-    def from_row(cls, row: List[str]) -> "User":
-        uid, name = row
-        return cls(name, int(uid))
-
-
-class Loan:                         # plain record (→ composition)
-    DATE_FMT = "%Y-%m-%d"
-
-    def __init__(self, user_id: int, book_id: int,
-                 borrow_date: dt.date, return_date: Optional[dt.date]=None):
-        self.user_id, self.book_id = user_id, book_id
-        self.borrow_date, self.return_date = borrow_date, return_date
-
-    def is_returned(self) -> bool:
-        return self.return_date is not None
-
-    def to_row(self) -> List[str]:
-        rdate = self.return_date.strftime(self.DATE_FMT) if self.return_date else ''
-        return [str(self.user_id), str(self.book_id),
-                self.borrow_date.strftime(self.DATE_FMT), rdate]
-
-    @classmethod
-    def from_row(cls, row: List[str]) -> "Loan":
-        uid, bid, bdate, rdate = row
-        borrow_date = dt.datetime.strptime(bdate, cls.DATE_FMT).date()
-        return_date = (dt.datetime.strptime(rdate, cls.DATE_FMT).date()
-                       if rdate else None)
-        return cls(int(uid), int(bid), borrow_date, return_date)
-
-
-# ────────────────────────────────────────────────────────────
-# PERSISTENCE LAYER
-# ────────────────────────────────────────────────────────────
-class CSVRepository:                # ← parent class
-    """Abstract CSV persistence ; subclasses specify filename & model."""
-    file: Path  = NotImplemented
-    model      = NotImplemented     # Book / User / Loan
-
-    @classmethod
-    def load_all(cls) -> Dict[int, object]:
-        if not cls.file.exists():
-            return {}
-        with cls.file.open(newline='', encoding='utf8') as fh:
-            reader = csv.reader(fh)
-            return {item.id: item
-                    for item in (cls.model.from_row(r) for r in reader)}
-
-    @classmethod
-    def save_all(cls, objects: Dict[int, object]) -> None:
-        cls.file.parent.mkdir(exist_ok=True)
-        with cls.file.open('w', newline='', encoding='utf8') as fh:
-            writer = csv.writer(fh)
-            for obj in objects.values():
-                writer.writerow(obj.to_row())
-
-
-class BookRepo(CSVRepository):      # ← multilevel inheritance
-    file, model = BOOKS_FILE, Book
-
-
-class UserRepo(CSVRepository):
-    file, model = USERS_FILE, User
-
-
-class LoanRepo(CSVRepository):
-    file, model = LOANS_FILE, Loan
-
-
-# ────────────────────────────────────────────────────────────
-# LIBRARY FACADE
-# ────────────────────────────────────────────────────────────
-class Library:
-    def __init__(self) -> None:
-        self.books: Dict[int, Book] = BookRepo.load_all()
-        self.users: Dict[int, User] = UserRepo.load_all()
-        self.loans: List[Loan]      = list(LoanRepo.load_all().values())
-
-    # CRUD - BOOKS ───────────────────────
-    def add_book(self, title: str, author: str, copies: int) -> None:
-        book = Book(title, author, copies)
-        self.books[book.id] = book
-        BookRepo.save_all(self.books)
-
-    def delete_book(self, book_id: int) -> bool:
-        if book_id in self.books and self.books[book_id].available == self.books[book_id].total:
-            self.books.pop(book_id)
-            BookRepo.save_all(self.books)
-            return True
-        return False        # reject if copies issued
-
-    # USERS ──────────────────────────────
-    def add_user(self, name: str) -> None:
-        user = User(name)
-        self.users[user.id] = user
-        UserRepo.save_all(self.users)
-
-    # ISSUE / RETURN ─────────────────────
-    def issue_book(self, user_id: int, book_id: int) -> bool:
-        if (user_id in self.users and
-                book_id in self.books and
-                self.books[book_id].available > 0):
-            self.books[book_id].available -= 1
-            self.loans.append(
-                Loan(user_id, book_id, dt.date.today()))
-            BookRepo.save_all(self.books)
-            LoanRepo.save_all({i: l for i, l in enumerate(self.loans)})
-            return True
-        return False
-
-    def return_book(self, user_id: int, book_id: int) -> bool:
-        for loan in self.loans:
-            if (loan.user_id == user_id and loan.book_id == book_id
-                    and not loan.is_returned()):
-                loan.return_date = dt.date.today()
-                self.books[book_id].available += 1
-                BookRepo.save_all(self.books)
-                LoanRepo.save_all({i: l for i, l in enumerate(self.loans)})
-                return True
-        return False
-
-    # REPORTING ──────────────────────────
-    def list_books(self) -> List[Book]:
-        return sorted(self.books.values(), key=lambda b: b.id)
-
-    def list_users(self) -> List[User]:
-        return sorted(self.users.values(), key=lambda u: u.id)
-
-    def user_loans(self, user_id: int) -> List[Loan]:
-        return [l for l in self.loans if l.user_id == user_id and not l.is_returned()]
-
-
-# ────────────────────────────────────────────────────────────
-# CLI MENUS
-# ────────────────────────────────────────────────────────────
-def pause() -> None:
-    input("\nPress <Enter> to continue...")
-
-def clear() -> None:
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def header(text: str) -> None:
-    print("=" * 60)
-    print(text.center(60))
-    print("=" * 60)
-
-def main_menu(lib: Library) -> None:
-    while True:
-        clear()
-        header("Library Management System")
-        print(dedent("""\
-            1. Add Book
-            2. View Books
-            3. Delete Book
-            4. Register User
-            5. View Users
-            6. Issue Book
-            7. Return Book
-            8. View User Loans
-            9. Exit"""))
-        choice = input("Select option: ").strip()
-        if choice == '1':
-            add_book_menu(lib)
-        elif choice == '2':
-            list_books_menu(lib)
-        elif choice == '3':
-            del_book_menu(lib)
-        elif choice == '4':
-            add_user_menu(lib)
-        elif choice == '5':
-            list_users_menu(lib)
-        elif choice == '6':
-            issue_menu(lib)
-        elif choice == '7':
-            return_menu(lib)
-        elif choice == '8':
-            loans_menu(lib)
-        elif choice == '9':
-            break
-        else:
-            print("Invalid option!")
-            pause()
-
-# individual menu helpers (brevity - simple input validation)
-def add_book_menu(lib: Library):
-    clear(); header("Add Book")
-    title  = input("Title : ")
-    author = input("Author: ")
-    copies = int(input("Total copies: "))
-    lib.add_book(title, author, copies)
-    print("Book added successfully!")
-    pause()
-
-def list_books_menu(lib: Library):
-    clear(); header("Available Books")
-    print(f"{'ID':<5}{'Title':<30}{'Author':<20}{'Avail/Total'}")
-    for b in lib.list_books():
-        print(f"{b.id:<5}{b.title:<30}{b.author:<20}{b.available}/{b.total}")
-    pause()
-
-def del_book_menu(lib: Library):
-    clear(); header("Delete Book")
-    bid = int(input("Enter Book ID to delete: "))
-    if lib.delete_book(bid):
-        print("Book deleted.")
-    else:
-        print("Cannot delete (inexistent or copies issued).")
-    pause()
-
-def add_user_menu(lib: Library):
-    clear(); header("Register User")
-    name = input("User name: ")
-    lib.add_user(name)
-    print("User registered.")
-    pause()
-
-def list_users_menu(lib: Library):
-    clear(); header("Registered Users")
-    print(f"{'ID':<5}{'Name'}")
-    for u in lib.list_users():
-        print(f"{u.id:<5}{u.name}")
-    pause()
-
-def issue_menu(lib: Library):
-    clear(); header("Issue Book")
-    uid = int(input("User ID : "))
-    bid = int(input("Book ID : "))
-    if lib.issue_book(uid, bid):
-        print("Book issued.")
-    else:
-        print("Error issuing book (check IDs / availability).")
-    pause()
-
-def return_menu(lib: Library):
-    clear(); header("Return Book")
-    uid = int(input("User ID : "))
-    bid = int(input("Book ID : "))
-    if lib.return_book(uid, bid):
-        print("Book returned. Thank you!")
-    else:
-        print("Error processing return.")
-    pause()
-
-def loans_menu(lib: Library):
-    clear(); header("User Loans")
-    uid = int(input("User ID : "))
-    loans = lib.user_loans(uid)
-    if loans:
-        print(f"\nBooks currently borrowed by user {uid}:")
-        for loan in loans:
-            book = lib.books[loan.book_id]
-            print(f"• {book.title} (since {loan.borrow_date})")
-    else:
-        print("No active loans.")
-    pause()
-
-
-# ────────────────────────────────────────────────────────────
-# ENTRY POINT
-# ────────────────────────────────────────────────────────────
-if __name__ == "__main__":
-    library = Library()
-    try:
-        main_menu(library)
-    finally:
-        # Persist again on exit (safety)
-        BookRepo.save_all(library.books)
-        UserRepo.save_all(library.users)
-        LoanRepo.save_all({i: l for i, l in enumerate(library.loans)})
+#!/usr/bin/env python3
+"""
+Library Management System (File-based)
+
+• Console, menu–driven interface
+• OOP design with single & multilevel inheritance
+• storage in CSV files (books, users, loans)
+
+CSV schema
+──────────
+books.csv          →  id,title,author,total,available
+users.csv          →  id,name
+active_loans.csv   →  user_id,book_id,borrow_date,return_date (empty)
+loans_history.csv  →  user_id,book_id,borrow_date,return_date
+"""
+from __future__ import annotations
+import atexit
+import csv
+import datetime as dt
+import os
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from textwrap import dedent
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DATA_DIR = Path(__file__).with_suffix('')  # folder where script resides
+BOOKS_FILE   = DATA_DIR / "books.csv"
+USERS_FILE   = DATA_DIR / "users.csv"
+LOANS_FILE   = DATA_DIR / "loans.csv"          # legacy, migrated on startup
+ACTIVE_FILE  = DATA_DIR / "active_loans.csv"
+HISTORY_FILE = DATA_DIR / "loans_history.csv"
+
+
+# ────────────────────────────────────────────────────────────
+# DATA MODELS
+# ────────────────────────────────────────────────────────────
+class Entity:                       # ← base class
+    """Generic object that owns a numeric id."""
+    __slots__ = ("id",)             # no per-instance __dict__
+    _id_counter = 1
+
+    def __init__(self, entity_id: Optional[int] = None):
+        self.id = entity_id or Entity._id_counter
+        Entity._id_counter = max(Entity._id_counter, self.id + 1)
+
+
+class Book(Entity):                 # ← single inheritance
+    __slots__ = ("title", "author", "total", "available")
+
+    def __init__(self, title: str, author: str,
+                 total: int, available: int | None = None,
+                 entity_id: Optional[int] = None):
+        super().__init__(entity_id)
+        # commas are the column separator and quotes mark legacy rows →
+        # strip both at insertion time so rows stay unambiguous
+        self.title  = title.replace(',', ' ').replace('"', "'")
+        self.author = author.replace(',', ' ').replace('"', "'")
+        self.total = total
+        self.available = available if available is not None else total
+
+    # convenience helpers
+    def to_row(self) -> str:
+        return f"{self.id},{self.title},{self.author},{self.total},{self.available}"
+
+    @classmethod
+    def from_row(cls, row: List[str]) -> "Book":
+        bid, title, author, total, avail = row
+        return cls(title, author, int(total), int(avail), int(bid))
+
+
+class User(Entity):                 # ← single inheritance
+    __slots__ = ("name",)
+
+    def __init__(self, name: str, entity_id: Optional[int] = None):
+        super().__init__(entity_id)
+        self.name = name.replace(',', ' ').replace('"', "'")
+
+    def to_row(self) -> str:
+        return f"{self.id},{self.name}"
+
+    @classmethod
+    def from_row(cls, row: List[str]) -> "User":
+        uid, name = row
+        return cls(name, int(uid))
+
+
+_DATE_CACHE: Dict[str, dt.date] = {}    # parsed dates, keyed by raw string
+
+
+def _fmt_date(d: dt.date) -> str:
+    # fixed YYYY-MM-DD layout → f-string beats strftime ~4× (no locale machinery)
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+class Loan:                         # plain record (→ composition)
+    __slots__ = ("user_id", "book_id", "borrow_date", "return_date")
+
+    def __init__(self, user_id: int, book_id: int,
+                 borrow_date: dt.date, return_date: Optional[dt.date]=None):
+        self.user_id, self.book_id = user_id, book_id
+        self.borrow_date, self.return_date = borrow_date, return_date
+
+    def is_returned(self) -> bool:
+        return self.return_date is not None
+
+    def to_row(self) -> str:
+        rdate = _fmt_date(self.return_date) if self.return_date else ''
+        return f"{self.user_id},{self.book_id},{_fmt_date(self.borrow_date)},{rdate}"
+
+    @staticmethod
+    def _parse_date(s: str) -> dt.date:
+        # fixed YYYY-MM-DD layout → int-slicing beats strptime ~10×;
+        # bulk issues share dates, so memoize by the raw string
+        d = _DATE_CACHE.get(s)
+        if d is None:
+            d = _DATE_CACHE[s] = dt.date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+        return d
+
+    @classmethod
+    def from_row(cls, row: List[str]) -> "Loan":
+        uid, bid, bdate, rdate = row
+        borrow_date = cls._parse_date(bdate)
+        return_date = cls._parse_date(rdate) if rdate else None
+        return cls(int(uid), int(bid), borrow_date, return_date)
+
+
+# ────────────────────────────────────────────────────────────
+# PERSISTENCE LAYER
+# ────────────────────────────────────────────────────────────
+class CSVRepository:                # ← parent class
+    """Abstract CSV persistence ; subclasses specify filename & model."""
+    file: Path  = NotImplemented
+    model      = NotImplemented     # Book / User / Loan
+    _append_fh = None               # cached handle for append_row
+
+    @classmethod
+    def load_all(cls) -> Dict[int, object]:
+        if not cls.file.exists():
+            return {}
+        # universal newlines (no newline='') fold the \r\n endings that
+        # the old csv.writer produced, so legacy rows split cleanly
+        with cls.file.open(encoding='utf8',
+                           buffering=1 << 20) as fh:   # 1 MiB → fewer syscalls
+            # the schemas are unquoted → raw splits beat csv.reader 3-5×
+            rows = [ln.split(',') for ln in fh.read().split('\n') if ln]
+        from_row = cls.model.from_row   # bind once, outside the row loop
+        return {item.id: item for item in map(from_row, rows)}
+
+    @classmethod
+    def save_all(cls, objects: Iterable[object]) -> None:
+        cls._close_append()         # rewrite supersedes the append handle
+        if isinstance(objects, Mapping):
+            objects = objects.values()
+        cls.file.parent.mkdir(exist_ok=True)
+        with cls.file.open('w', newline='', encoding='utf8',
+                           buffering=1 << 20) as fh:
+            fh.write(''.join(obj.to_row() + '\n' for obj in objects))
+
+    @classmethod
+    def append_row(cls, obj) -> None:
+        """Append one row — O(1) instead of rewriting the whole file."""
+        if cls._append_fh is None:
+            cls.file.parent.mkdir(exist_ok=True)
+            cls._append_fh = cls.file.open('a', newline='', encoding='utf8',
+                                           buffering=1 << 20)
+        cls._append_fh.write(obj.to_row() + '\n')
+        cls._append_fh.flush()
+
+    @classmethod
+    def _close_append(cls) -> None:
+        if cls._append_fh is not None:
+            cls._append_fh.close()
+            cls._append_fh = None
+
+
+class BookRepo(CSVRepository):      # ← multilevel inheritance
+    file, model = BOOKS_FILE, Book
+
+
+class UserRepo(CSVRepository):
+    file, model = USERS_FILE, User
+
+
+class LoanRepoBase(CSVRepository):
+    model = Loan
+
+    @classmethod
+    def load_all(cls) -> Dict[int, Loan]:
+        # loans carry no id column — key them by file position instead
+        if not cls.file.exists():
+            return {}
+        from_row = Loan.from_row        # bind once, outside the row loop
+        with cls.file.open(encoding='utf8',
+                           buffering=1 << 20) as fh:
+            return {i: from_row(ln.split(','))
+                    for i, ln in enumerate(fh.read().split('\n')) if ln}
+
+
+class ActiveLoanRepo(LoanRepoBase):
+    """Open loans only — stays small (≈ books currently checked out)."""
+    file = ACTIVE_FILE
+
+
+class LoanHistoryRepo(LoanRepoBase):
+    """Returned loans, append-only; never read on the interactive paths."""
+    file = HISTORY_FILE
+
+
+# ────────────────────────────────────────────────────────────
+# LIBRARY FACADE
+# ────────────────────────────────────────────────────────────
+class Library:
+    FLUSH_EVERY = 64                # compact deferred writes every K transactions
+
+    def __init__(self) -> None:
+        self._migrate_legacy_quoting()
+        self._migrate_legacy_loans()
+        self.books: Dict[int, Book] = BookRepo.load_all()
+        self.users: Dict[int, User] = UserRepo.load_all()
+        # only open loans stay resident, grouped per (user, book) pair in
+        # issue order; the full history lives append-only on disk
+        self.active: Dict[Tuple[int, int], List[Loan]] = {}
+        for loan in ActiveLoanRepo.load_all().values():
+            self.active.setdefault((loan.user_id, loan.book_id), []).append(loan)
+        self._dirty: Set[type] = set()  # repos with unsaved changes
+        self._ops = 0
+        atexit.register(self.flush)     # last-resort checkpoint
+
+    @staticmethod
+    def _migrate_legacy_quoting() -> None:
+        """One-time rewrite of baseline files whose csv.writer quoted commas."""
+        for repo in (BookRepo, UserRepo):
+            if not repo.file.exists():
+                continue
+            if '"' not in repo.file.read_text(encoding='utf8'):
+                continue                    # already in the raw format
+            with repo.file.open(newline='', encoding='utf8') as fh:
+                items = [repo.model.from_row(r) for r in csv.reader(fh)]
+            repo.save_all(items)            # constructors re-sanitize fields
+
+    @staticmethod
+    def _migrate_legacy_loans() -> None:
+        """One-time split of the old loans.csv into active + history files."""
+        if not LOANS_FILE.exists() or ACTIVE_FILE.exists() or HISTORY_FILE.exists():
+            return
+        loans = [Loan.from_row(ln.split(','))
+                 for ln in LOANS_FILE.read_text(encoding='utf8').split('\n') if ln]
+        ActiveLoanRepo.save_all(l for l in loans if not l.is_returned())
+        LoanHistoryRepo.save_all(l for l in loans if l.is_returned())
+        LOANS_FILE.rename(LOANS_FILE.with_suffix('.csv.bak'))
+
+    def _active_loans(self):
+        for stack in self.active.values():
+            yield from stack
+
+    # CRUD - BOOKS ───────────────────────
+    def add_book(self, title: str, author: str, copies: int) -> None:
+        book = Book(title, author, copies)
+        self.books[book.id] = book
+        self.mark_dirty(BookRepo)
+
+    def delete_book(self, book_id: int) -> bool:
+        if book_id in self.books and self.books[book_id].available == self.books[book_id].total:
+            self.books.pop(book_id)
+            self.mark_dirty(BookRepo)
+            return True
+        return False        # reject if copies issued
+
+    # USERS ──────────────────────────────
+    def add_user(self, name: str) -> None:
+        user = User(name)
+        self.users[user.id] = user
+        self.mark_dirty(UserRepo)
+
+    # ISSUE / RETURN ─────────────────────
+    def issue_book(self, user_id: int, book_id: int) -> bool:
+        if (user_id in self.users and
+                book_id in self.books and
+                self.books[book_id].available > 0):
+            self.books[book_id].available -= 1
+            loan = Loan(user_id, book_id, dt.date.today())
+            self.active.setdefault((user_id, book_id), []).append(loan)
+            ActiveLoanRepo.append_row(loan)  # one row, not a full rewrite
+            self.mark_dirty(BookRepo)
+            return True
+        return False
+
+    def return_book(self, user_id: int, book_id: int) -> bool:
+        stack = self.active.get((user_id, book_id))
+        if not stack:
+            return False
+        loan = stack.pop(0)                 # oldest copy first
+        if not stack:
+            del self.active[(user_id, book_id)]
+        loan.return_date = dt.date.today()
+        LoanHistoryRepo.append_row(loan)    # history is append-only
+        self.books[book_id].available += 1
+        self.mark_dirty(ActiveLoanRepo)
+        self.mark_dirty(BookRepo)
+        return True
+
+    # deferred persistence ───────────────
+    def mark_dirty(self, repo: type) -> None:
+        """Record an unsaved change; checkpoint every FLUSH_EVERY mutations."""
+        self._dirty.add(repo)
+        self._ops += 1
+        if self._ops % self.FLUSH_EVERY == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out whatever is dirty (checkpoints and exit go through here)."""
+        if BookRepo in self._dirty:
+            BookRepo.save_all(self.books)
+        if UserRepo in self._dirty:
+            UserRepo.save_all(self.users)
+        if ActiveLoanRepo in self._dirty:
+            ActiveLoanRepo.save_all(self._active_loans())
+        self._dirty.clear()
+
+    # REPORTING ──────────────────────────
+    # ids are monotonic (Entity._id_counter) and dicts keep insertion
+    # order, so the repos are already sorted — no per-display sort needed
+    def list_books(self) -> List[Book]:
+        return list(self.books.values())
+
+    def list_users(self) -> List[User]:
+        return list(self.users.values())
+
+    def user_loans(self, user_id: int) -> List[Loan]:
+        return [l for l in self._active_loans() if l.user_id == user_id]
+
+
+# ────────────────────────────────────────────────────────────
+# CLI MENUS
+# ────────────────────────────────────────────────────────────
+def pause() -> None:
+    input("\nPress <Enter> to continue...")
+
+if os.name == 'nt':
+    os.system('')               # one-time no-op enables VT escapes on Windows
+
+def clear() -> None:
+    # ANSI clear+home — no fork/exec of an external program per redraw
+    sys.stdout.write('\x1b[2J\x1b[H')
+    sys.stdout.flush()
+
+def header(text: str) -> None:
+    print("=" * 60)
+    print(text.center(60))
+    print("=" * 60)
+
+def main_menu(lib: Library) -> None:
+    while True:
+        clear()
+        header("Library Management System")
+        print(dedent("""\
+            1. Add Book
+            2. View Books
+            3. Delete Book
+            4. Register User
+            5. View Users
+            6. Issue Book
+            7. Return Book
+            8. View User Loans
+            9. Exit"""))
+        choice = input("Select option: ").strip()
+        if choice == '1':
+            add_book_menu(lib)
+        elif choice == '2':
+            list_books_menu(lib)
+        elif choice == '3':
+            del_book_menu(lib)
+        elif choice == '4':
+            add_user_menu(lib)
+        elif choice == '5':
+            list_users_menu(lib)
+        elif choice == '6':
+            issue_menu(lib)
+        elif choice == '7':
+            return_menu(lib)
+        elif choice == '8':
+            loans_menu(lib)
+        elif choice == '9':
+            break
+        else:
+            print("Invalid option!")
+            pause()
+
+# individual menu helpers (brevity - simple input validation)
+def add_book_menu(lib: Library):
+    clear(); header("Add Book")
+    title  = input("Title : ")
+    author = input("Author: ")
+    copies = int(input("Total copies: "))
+    lib.add_book(title, author, copies)
+    print("Book added successfully!")
+    pause()
+
+def list_books_menu(lib: Library):
+    clear(); header("Available Books")
+    print(f"{'ID':<5}{'Title':<30}{'Author':<20}{'Avail/Total'}")
+    for b in lib.list_books():
+        print(f"{b.id:<5}{b.title:<30}{b.author:<20}{b.available}/{b.total}")
+    pause()
+
+def del_book_menu(lib: Library):
+    clear(); header("Delete Book")
+    bid = int(input("Enter Book ID to delete: "))
+    if lib.delete_book(bid):
+        print("Book deleted.")
+    else:
+        print("Cannot delete (inexistent or copies issued).")
+    pause()
+
+def add_user_menu(lib: Library):
+    clear(); header("Register User")
+    name = input("User name: ")
+    lib.add_user(name)
+    print("User registered.")
+    pause()
+
+def list_users_menu(lib: Library):
+    clear(); header("Registered Users")
+    print(f"{'ID':<5}{'Name'}")
+    for u in lib.list_users():
+        print(f"{u.id:<5}{u.name}")
+    pause()
+
+def issue_menu(lib: Library):
+    clear(); header("Issue Book")
+    uid = int(input("User ID : "))
+    bid = int(input("Book ID : "))
+    if lib.issue_book(uid, bid):
+        print("Book issued.")
+    else:
+        print("Error issuing book (check IDs / availability).")
+    pause()
+
+def return_menu(lib: Library):
+    clear(); header("Return Book")
+    uid = int(input("User ID : "))
+    bid = int(input("Book ID : "))
+    if lib.return_book(uid, bid):
+        print("Book returned. Thank you!")
+    else:
+        print("Error processing return.")
+    pause()
+
+def loans_menu(lib: Library):
+    clear(); header("User Loans")
+    uid = int(input("User ID : "))
+    loans = lib.user_loans(uid)
+    if loans:
+        print(f"\nBooks currently borrowed by user {uid}:")
+        for loan in loans:
+            book = lib.books[loan.book_id]
+            print(f"• {book.title} (since {loan.borrow_date})")
+    else:
+        print("No active loans.")
+    pause()
+
+
+# ────────────────────────────────────────────────────────────
+# ENTRY POINT
+# ────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    library = Library()
+    try:
+        main_menu(library)
+    finally:
+        # Persist deferred state on exit (atexit covers abnormal paths too)
+        library.flush()